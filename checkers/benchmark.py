@@ -0,0 +1,233 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .constants import WHITE
+from .minimax import minimax, get_move_list, stats
+from .positions import benchmark_positions
+
+DEFAULT_DEPTHS = [3, 4, 5, 6, 7]
+DEFAULT_BASELINE = 'benchmarks/baseline.json'
+# Allowed relative change before a metric counts as a regression
+DEFAULT_THRESHOLDS = {
+    'time': 0.25,   # Timings and throughputs (noisy, so the widest margin)
+    'memory': 0.10, # Peak traced memory
+    'nodes': 0.05,  # Searched node counts (deterministic, any growth is a search change)
+}
+# Which threshold groups a baseline is valid for, given the baseline's 'meta':
+# node counts are portable, memory depends on the Python version, timings on the exact host
+GROUP_SCOPE = {
+    'nodes': (),
+    'memory': ('python',),
+    'time': ('host', 'python', 'machine'),
+}
+# Metric name -> (threshold group, True if higher is better)
+METRICS = {
+    'move_gen_per_sec': ('time', True),
+    'evaluate_per_sec': ('time', True),
+    'seconds': ('time', False),
+    'nodes_per_sec': ('time', True),
+    'nodes': ('nodes', False),
+    'peak_kib': ('memory', False),
+}
+MEMORY_WARMUP_RUNS = 3 # Untraced searches before measuring peak memory
+MEMORY_RUNS = 5        # Traced searches, the smallest peak is kept
+# Selective search settings being benchmarked, the same as the game's (full-width search)
+SELECTIVE = None
+
+
+def _throughput(func, min_seconds, repeat):
+    """Returns calls per second of func(), best of `repeat` runs of at least `min_seconds` each."""
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+        best = max(best, calls / elapsed)
+    return best
+
+def _peak_memory(name, depth):
+    """
+    Returns peak traced memory (bytes above the starting level) of one benchmark search.
+
+    The peak depends on interpreter state (free lists, pending garbage) left by earlier work, so it is
+    measured in a fresh interpreter with a fixed hash seed, see _memory_probe.
+    """
+    env = dict(os.environ, PYTHONHASHSEED='0', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    output = subprocess.run([sys.executable, '-m', 'checkers.benchmark', '--memory-probe', name, str(depth)],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return int(output.split()[-1])
+
+def _memory_probe(name, depth):
+    """Prints the smallest traced peak of MEMORY_RUNS searches of a position, run by _peak_memory."""
+    board, color = next((board, color) for position, board, color in benchmark_positions() if position == name)
+    # The first traced runs read several times higher until free lists fill up, so warm up first
+    for _ in range(MEMORY_WARMUP_RUNS):
+        _search(board, depth, color == WHITE)
+    gc.collect()
+    tracemalloc.start()
+    best = float('inf')
+    for _ in range(MEMORY_RUNS):
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        _search(board, depth, color == WHITE)
+        best = min(best, tracemalloc.get_traced_memory()[1] - start)
+    tracemalloc.stop()
+    print(best)
+
+def _search(board, depth, is_max_player):
+    """Runs one benchmark search and returns its node count."""
+    stats.reset()
+    minimax(board, depth, is_max_player, None, float('-inf'), float('+inf'), selective=SELECTIVE)
+    return stats.nodes
+
+def run_benchmarks(depths=DEFAULT_DEPTHS, repeat=5, min_seconds=0.2):
+    """Measures every metric for every benchmark position, returns the results as a JSON-ready dict."""
+    results = {
+        'meta': {
+            'host': platform.node(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'selective': repr(SELECTIVE),
+            'depths': list(depths),
+        },
+        'positions': {},
+    }
+    for name, board, color in benchmark_positions():
+        is_max_player = color == WHITE
+        position = {
+            'move_gen_per_sec': _throughput(lambda: get_move_list(board, color), min_seconds, repeat),
+            'evaluate_per_sec': _throughput(board.evaluate, min_seconds, repeat),
+            'search': {},
+        }
+        for depth in depths:
+            # Short searches are repeated like the throughput metrics so their timings are not just noise
+            seconds = 1 / _throughput(lambda: _search(board, depth, is_max_player), min_seconds, repeat)
+            nodes = _search(board, depth, is_max_player)
+            # tracemalloc slows code down, so memory gets its own runs
+            peak = _peak_memory(name, depth)
+            position['search'][str(depth)] = {
+                'seconds': seconds,
+                'nodes': nodes,
+                'nodes_per_sec': nodes / seconds,
+                'peak_kib': peak / 1024,
+            }
+        results['positions'][name] = position
+    return results
+
+
+def _metric_rows(results):
+    """Yields (label, metric, value) for every metric in a results dict."""
+    for name, position in results['positions'].items():
+        for metric in ('move_gen_per_sec', 'evaluate_per_sec'):
+            if metric in position:
+                yield name, metric, position[metric]
+        for depth, search in position['search'].items():
+            for metric, value in search.items():
+                yield f"{name} d{depth}", metric, value
+
+def comparable_groups(results, baseline):
+    """Returns the threshold groups whose baseline values apply here (see GROUP_SCOPE)."""
+    return [group for group, keys in GROUP_SCOPE.items()
+            if all(results['meta'].get(key) == baseline['meta'].get(key) for key in keys)]
+
+def compare(results, baseline, thresholds=DEFAULT_THRESHOLDS):
+    """
+    Compares results against baseline results.
+    Returns a list of (label, metric, baseline value, current value, relative change, regressed) tuples.
+    Metrics missing from the baseline (e.g. a new depth) and groups the baseline is not valid for
+    (e.g. timings saved on another host) are skipped.
+    """
+    groups = comparable_groups(results, baseline)
+    baseline_values = {(label, metric): value for label, metric, value in _metric_rows(baseline)}
+    rows = []
+    for label, metric, value in _metric_rows(results):
+        old = baseline_values.get((label, metric))
+        group, higher_is_better = METRICS[metric]
+        if old is None or old == 0 or group not in groups:
+            continue
+        change = (value - old) / old
+        regressed = -change > thresholds[group] if higher_is_better else change > thresholds[group]
+        rows.append((label, metric, old, value, change, regressed))
+    return rows
+
+def portable(results):
+    """Returns a copy of results without timings or host name, for a baseline shared across machines."""
+    timed = [metric for metric, (group, _) in METRICS.items() if group == 'time']
+    meta = {key: value for key, value in results['meta'].items() if key != 'host'}
+    positions = {}
+    for name, position in results['positions'].items():
+        positions[name] = {metric: value for metric, value in position.items() if metric not in timed}
+        positions[name]['search'] = {depth: {metric: value for metric, value in search.items() if metric not in timed}
+                                     for depth, search in position['search'].items()}
+    return {'meta': meta, 'positions': positions}
+
+def print_results(results):
+    """Prints a readable summary of benchmark results."""
+    for name, position in results['positions'].items():
+        print(f"{name}: move gen {position['move_gen_per_sec']:,.0f}/s, evaluate {position['evaluate_per_sec']:,.0f}/s")
+        for depth, search in position['search'].items():
+            print(f"  depth {depth}: {search['seconds']:8.3f}s {search['nodes']:>9,} nodes "
+                  f"{search['nodes_per_sec']:>9,.0f} nodes/s  peak {search['peak_kib']:8.1f} KiB")
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--memory-probe']: # Internal: child process started by _peak_memory
+        _memory_probe(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Search performance benchmarks with baseline regression check.")
+    parser.add_argument('--depths', type=int, nargs='+', default=DEFAULT_DEPTHS, help="minimax depths (default 3-7)")
+    parser.add_argument('--repeat', type=int, default=5, help="timing runs per measurement, best is kept (default 5)")
+    parser.add_argument('--output', default='benchmark_results.json', help="where to write the JSON results")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help=f"baseline JSON to compare with (default {DEFAULT_BASELINE})")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results to the baseline file instead of comparing")
+    parser.add_argument('--portable', action='store_true',
+                        help="with --save-baseline, leave out timings and host so the baseline can be committed")
+    for group, threshold in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f'--{group}-threshold', type=float, default=threshold,
+                            help=f"allowed relative {group} regression (default {threshold})")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.depths, args.repeat)
+    print_results(results)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(portable(results) if args.portable else results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one first.")
+        sys.exit(0)
+
+    thresholds = {group: getattr(args, f'{group}_threshold') for group in DEFAULT_THRESHOLDS}
+    rows = compare(results, baseline, thresholds)
+    regressions = [row for row in rows if row[5]]
+    groups = comparable_groups(results, baseline)
+    print(f"\nCompared {len(rows)} metrics against {args.baseline} (groups: {', '.join(groups)})")
+    for group in GROUP_SCOPE:
+        if group not in groups:
+            print(f"  Skipped {group}: baseline was saved with a different {'/'.join(GROUP_SCOPE[group])}")
+    for label, metric, old, value, change, _ in regressions:
+        print(f"  REGRESSION {label} {metric}: {old:,.3f} -> {value:,.3f} ({change:+.1%})")
+    print("FAIL" if regressions else "PASS")
+    sys.exit(1 if regressions else 0)
@@ -1,7 +1,17 @@
+import random
 import pygame
 from .constants import BLACK, ROWS, RED, SQUARE_SIZE, COLS, WHITE, LIGHT_WOOD, DARK_WOOD, BOARD_OFFSET_X, BOARD_OFFSET_Y
 from .piece import Piece
 
+# Zobrist keys for position hashing: one 64-bit key per (color, king, square), plus side to move.
+# Fixed seed so every process derives identical keys (required by the on-disk search cache).
+_zobrist_rng = random.Random(481)
+ZOBRIST_PIECES = {
+    (color, king): [[_zobrist_rng.getrandbits(64) for _ in range(COLS)] for _ in range(ROWS)]
+    for color in (RED, WHITE) for king in (False, True)
+}
+ZOBRIST_WHITE_TO_MOVE = _zobrist_rng.getrandbits(64)
+
 class Board:
     """ Manages game board state and logic, includes heuristic evaluation function for AI. """
     def __init__(self):
@@ -84,6 +94,45 @@ class Board:
                      self.white_left -= 1
                      if piece.king: self.white_kings -= 1 # Decrement king count
 
+    def make_move(self, move):
+        """
+        Applies a Move record to the board (including kinging and captures).
+        Returns undo info for unmake_move: (promoted, captured) with captured as (row, col, color, king) tuples.
+        """
+        from_row, from_col = move.from_square
+        piece = self.board[from_row][from_col]
+        was_king = piece.king
+        self.move(piece, *move.to_square)
+        captured_pieces = [self.board[row][col] for row, col in move.captured]
+        captured = tuple((p.row, p.col, p.color, p.king) for p in captured_pieces)
+        self.remove(captured_pieces)
+        return piece.king and not was_king, captured
+
+    def unmake_move(self, move, undo):
+        """Reverts a move applied by make_move, given the undo info it returned."""
+        promoted, captured = undo
+        to_row, to_col = move.to_square
+        piece = self.board[to_row][to_col]
+        if promoted:
+            piece.king = False
+            if piece.color == WHITE:
+                self.white_kings -= 1
+            else:
+                self.red_kings -= 1
+        # A man never starts on its own crowning row, so moving back cannot king it again
+        self.move(piece, *move.from_square)
+        for row, col, color, king in captured:
+            restored = Piece(row, col, color)
+            if king:
+                restored.make_king()
+            self.board[row][col] = restored
+            if color == RED:
+                self.red_left += 1
+                if king: self.red_kings += 1
+            else:
+                self.white_left += 1
+                if king: self.white_kings += 1
+
     def winner(self):
         """Determines if there is a winner"""
         if self.red_left <= 0:
@@ -205,6 +254,38 @@ class Board:
         
         return score
 
+    def hash_key(self, color):
+        """Returns a 64-bit Zobrist key for this position with `color` to move."""
+        key = ZOBRIST_WHITE_TO_MOVE if color == WHITE else 0
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = self.board[row][col]
+                if piece != 0:
+                    key ^= ZOBRIST_PIECES[(piece.color, piece.king)][row][col]
+        return key
+
+    def canonical_key(self, color):
+        """
+        Returns (key, mirrored): a Zobrist key shared by this position and its color-swapped mirror.
+
+        Rotating the board 180 degrees and swapping red/white (including the side to move) gives an
+        equivalent position whose evaluate() score is exactly negated. The smaller of the two keys is
+        used, mirrored is True when that is the mirror's key, in which case scores must be negated and
+        moves rotated (see cache.mirror_move) when storing or reading cache entries.
+        """
+        key = ZOBRIST_WHITE_TO_MOVE if color == WHITE else 0
+        mirror_key = 0 if color == WHITE else ZOBRIST_WHITE_TO_MOVE
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = self.board[row][col]
+                if piece != 0:
+                    key ^= ZOBRIST_PIECES[(piece.color, piece.king)][row][col]
+                    mirror_color = RED if piece.color == WHITE else WHITE
+                    mirror_key ^= ZOBRIST_PIECES[(mirror_color, piece.king)][ROWS - 1 - row][COLS - 1 - col]
+        if mirror_key < key:
+            return mirror_key, True
+        return key, False
+
     def get_all_pieces(self, color):
         """Returns a list of all piece objects of a given color."""
         pieces = []
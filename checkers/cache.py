@@ -0,0 +1,203 @@
+import mmap
+import os
+import struct
+
+# Bound types stored with each score (alpha-beta results are often only bounds)
+EXACT = 0
+LOWER_BOUND = 1 # Real score >= stored score (search failed high)
+UPPER_BOUND = 2 # Real score <= stored score (search failed low)
+
+NO_MOVE = 0xFFFF # Best-move code meaning "no move stored"
+
+# File layout: header, then a fixed array of equally sized slots
+_HEADER = struct.Struct('<8sIIQ') # magic, version, slot count, generation
+_MAGIC = b'CHKRCACH'
+_VERSION = 2 # 2: keys are color-symmetric canonical keys (Board.canonical_key)
+# Slot: check word, then 16 bytes of data (score, best move, depth, flag, generation, padding)
+_SLOT = struct.Struct('<QdHBBH2x')
+_DATA = struct.Struct('<dHBBH2x')
+_DATA_WORDS = struct.Struct('<QQ')
+
+# Entries this many generations older than the writer are stale and replaced regardless of depth.
+# Processes sharing a file run in different generations, so smaller age gaps must not count as stale.
+MAX_ENTRY_AGE = 8
+
+
+def encode_move(from_row, from_col, to_row, to_col):
+    """Packs a move's from/to squares into a 16-bit code for cache storage."""
+    return (from_row * 8 + from_col) * 64 + to_row * 8 + to_col
+
+def decode_move(code):
+    """Unpacks a move code into ((from_row, from_col), (to_row, to_col))."""
+    from_square, to_square = divmod(code, 64)
+    return divmod(from_square, 8), divmod(to_square, 8)
+
+def mirror_move(code):
+    """Returns the code of the same move on the 180-degree rotated board (NO_MOVE stays NO_MOVE)."""
+    if code == NO_MOVE:
+        return code
+    from_square, to_square = divmod(code, 64)
+    return (63 - from_square) * 64 + (63 - to_square)
+
+def mirror_entry(score, flag, best):
+    """Translates (score, flag, best) between a position and its color-swapped mirror."""
+    # Negating the score turns a lower bound into an upper bound and vice versa
+    flag = {LOWER_BOUND: UPPER_BOUND, UPPER_BOUND: LOWER_BOUND}.get(flag, flag)
+    return -score, flag, mirror_move(best)
+
+
+class SlotTable:
+    """
+    Fixed-size transposition table stored in a raw byte buffer (mmap or shared memory).
+
+    Each slot stores its key XORed with its data words, so a slot torn by a concurrent
+    writer simply fails verification on read instead of returning a wrong entry.
+    This lets several processes read and write the same buffer without locks.
+    Subclasses set `_buffer`, `_base` (offset of slot 0), `slots` and `generation`.
+    """
+
+    def _offset(self, key):
+        """Returns byte offset of the slot for the given key."""
+        return self._base + (key % self.slots) * _SLOT.size
+
+    def _read_slot(self, offset):
+        """Returns (key, depth, score, flag, best, generation) for a slot, or None if empty/torn."""
+        check = struct.unpack_from('<Q', self._buffer, offset)[0]
+        word1, word2 = _DATA_WORDS.unpack_from(self._buffer, offset + 8)
+        score, best, depth, flag, generation = _DATA.unpack_from(self._buffer, offset + 8)
+        if depth == 0: # Empty slot (minimax never stores depth 0)
+            return None
+        return check ^ word1 ^ word2, depth, score, flag, best, generation
+
+    def _is_stale(self, generation):
+        """Returns True if an entry written in `generation` is at least MAX_ENTRY_AGE generations old."""
+        # Signed 16-bit difference, entries from newer generations (other processes) have a negative age
+        age = ((self.generation - generation + 0x8000) & 0xFFFF) - 0x8000
+        return age >= MAX_ENTRY_AGE
+
+    def _write_slot(self, key, depth, score, flag, best):
+        """Writes an entry into its slot, applying the replacement policy."""
+        offset = self._offset(key)
+        current = self._read_slot(offset)
+        # Replacement policy: take empty/torn slots and stale entries (at least MAX_ENTRY_AGE generations
+        # old), otherwise keep whichever result came from the deeper search, whichever process wrote it.
+        if current is not None and current[1] > depth and not self._is_stale(current[5]):
+            return
+        data = _DATA.pack(score, best, min(depth, 255), flag, self.generation)
+        word1, word2 = _DATA_WORDS.unpack(data)
+        self._buffer[offset:offset + _SLOT.size] = struct.pack('<Q', key ^ word1 ^ word2) + data
+
+    def probe(self, key):
+        """Returns (depth, score, flag, best_move_code) stored for key, or None on a miss."""
+        entry = self._read_slot(self._offset(key))
+        if entry is None or entry[0] != key:
+            return None
+        return entry[1:5]
+
+
+class PersistentCache(SlotTable):
+    """
+    Memory-mapped position cache: position hash -> (depth, score, bound flag, best move).
+
+    Used by minimax as a second-level transposition table that survives across games
+    and process restarts. Any number of processes may map the same file.
+    Writes are buffered and flushed to the mapping in batches.
+    """
+    DEFAULT_SLOTS = 1 << 20 # 24 MB file
+    DEFAULT_BATCH_SIZE = 4096
+
+    def __init__(self, path, slots=DEFAULT_SLOTS, read_only=False, batch_size=DEFAULT_BATCH_SIZE):
+        """Opens the cache file at `path`, creating it with `slots` empty slots if missing."""
+        self.path = path
+        self.read_only = read_only
+        self.batch_size = batch_size
+        self._pending = {} # Buffered writes: {key: (depth, score, flag, best)}
+
+        if not os.path.exists(path):
+            if read_only:
+                raise FileNotFoundError(f"Search cache file not found: {path}")
+            self._create_file(path, slots)
+
+        self._file = open(path, 'rb' if read_only else 'r+b')
+        access = mmap.ACCESS_READ if read_only else mmap.ACCESS_WRITE
+        self._map = self._buffer = mmap.mmap(self._file.fileno(), 0, access=access)
+        self._base = _HEADER.size
+
+        magic, version, self.slots, generation = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {_VERSION} search cache file")
+        if len(self._map) < _HEADER.size + self.slots * _SLOT.size:
+            self.close()
+            raise ValueError(f"Search cache file {path} is truncated")
+
+        # Each writer session gets a new generation, entries from long-past sessions become replaceable
+        if read_only:
+            self.generation = generation & 0xFFFF
+        else:
+            # Unsynchronised read-modify-write: two writers opening together may get the same generation.
+            # That is harmless, generations only decide which entries count as stale.
+            generation += 1
+            _HEADER.pack_into(self._map, 0, _MAGIC, _VERSION, self.slots, generation)
+            self.generation = generation & 0xFFFF
+
+    @staticmethod
+    def _create_file(path, slots):
+        """
+        Creates an empty cache file at `path` atomically, so processes starting together never see it half written.
+        The file is built under a temporary name and hard-linked into place. If another process created
+        `path` first, linking fails and that file is used instead of truncating it.
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, slots, 0))
+                f.truncate(_HEADER.size + slots * _SLOT.size) # Zero-filled (sparse where supported)
+            try:
+                os.link(temp_path, path)
+            except FileExistsError:
+                pass
+        finally:
+            os.unlink(temp_path)
+
+    def probe(self, key):
+        """Returns (depth, score, flag, best_move_code) stored for key, or None on a miss."""
+        if key in self._pending:
+            return self._pending[key]
+        return super().probe(key)
+
+    def store(self, key, depth, score, flag, best=NO_MOVE):
+        """Buffers a search result. Flushed to the file once `batch_size` results are pending."""
+        if self.read_only:
+            return
+        previous = self._pending.get(key)
+        if previous is None or depth >= previous[0]:
+            self._pending[key] = (depth, score, flag, best)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered results into their slots."""
+        if self.read_only or not self._pending:
+            return
+        for key, (depth, score, flag, best) in self._pending.items():
+            self._write_slot(key, depth, score, flag, best)
+        self._pending.clear()
+        self._map.flush()
+
+    def close(self):
+        """Flushes pending writes and unmaps the file."""
+        if self._map is None:
+            return
+        if not self._map.closed:
+            self.flush()
+            self._map.close()
+        self._file.close()
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,7 +1,10 @@
 import pygame
-from .constants import RED, WHITE, BLUE, SQUARE_SIZE, BOARD_OFFSET_X, BOARD_OFFSET_Y
+from .constants import RED, WHITE, BLUE, YELLOW, SQUARE_SIZE, BOARD_OFFSET_X, BOARD_OFFSET_Y
 from .board import Board
-from .minimax import get_all_moves as get_all_possible_next_boards
+from .minimax import get_move_list
+from .move import Move
+
+REPETITION_LIMIT = 3 # Same position with same side to move this many times is a draw
 
 class Game:
     """ Manages game state, player turns, and AI integration. """
@@ -16,10 +19,19 @@ class Game:
         self.turn = RED # Red starts
         self.valid_moves = {} # Store valid moves for selected piece
         self.winner_result = None
+        self.last_move = None # Last Move played (either side), for highlighting/logging
+        # Move history as compact diffs: [(Move, undo info from Board.make_move), ...]
+        # Entries before self.ply are on the board, entries from self.ply on can be redone.
+        self.history = []
+        self.ply = 0
+        # position_hashes[i] is the Zobrist key after i plies, hash_counts counts keys for plies 0..self.ply
+        self.position_hashes = [self.board.hash_key(self.turn)]
+        self.hash_counts = {self.position_hashes[0]: 1}
 
     def update(self):
         """Updates display with the current game state."""
         self.board.draw(self.win)
+        self.draw_last_move(self.last_move)
         self.draw_valid_moves(self.valid_moves)
 
     def check_winner(self):
@@ -30,9 +42,14 @@ class Game:
             self.winner_result = winner_by_pieces
             return self.winner_result
 
+        # Check for draw by repetition
+        if self.is_repetition():
+            self.winner_result = 'REPETITION'
+            return self.winner_result
+
         # Check for stalemate: current player has no valid moves
-        possible_moves = get_all_possible_next_boards(self.board, self.turn, self)
-        if not possible_moves: # If list of next board states is empty
+        possible_moves = get_move_list(self.board, self.turn)
+        if not possible_moves: # If list of legal moves is empty
             self.winner_result = 'STALEMATE'
             # player who cannot move loses:
             # self.winner_result = WHITE if self.turn == RED else RED
@@ -75,11 +92,9 @@ class Game:
         """Attempts to move the selected piece to (row, col)."""
          # Target square must be empty and be a key in valid_moves dict
         if self.selected and self.board.get_piece(row, col) == 0 and (row, col) in self.valid_moves:
-            self.board.move(self.selected, row, col)
             skipped = self.valid_moves[(row, col)] # Get list of skipped pieces
-            if skipped:
-                self.board.remove(skipped) # Remove captured pieces
-            self.change_turn() # Successful move, change turn
+            captured = tuple((piece.row, piece.col) for piece in skipped if piece != 0)
+            self._play(Move((self.selected.row, self.selected.col), (row, col), captured))
             return True
         # Invalid move target
         return False
@@ -94,6 +109,14 @@ class Game:
             # Draw small indicator circle
             pygame.draw.circle(self.win, BLUE, (center_x, center_y), 15)
 
+    def draw_last_move(self, move):
+        """Outlines the from/to squares of the last move played (by either side)."""
+        if move is None:
+            return
+        for row, col in (move.from_square, move.to_square):
+            rect = (BOARD_OFFSET_X + col * SQUARE_SIZE, BOARD_OFFSET_Y + row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+            pygame.draw.rect(self.win, YELLOW, rect, 3)
+
     def change_turn(self):
         """Switches player turn and clears valid moves."""
         self.valid_moves = {}
@@ -108,7 +131,61 @@ class Game:
         """Returns current board object."""
         return self.board
 
-    def ai_move(self, board):
-        """Applies the move chosen by the AI."""
-        self.board = board # Update board to new state returned by AI
-        self.change_turn() # AI finished, change turn back
\ No newline at end of file
+    def ai_move(self, move):
+        """Applies the Move chosen by the AI."""
+        self._play(move) # AI finished, change turn back
+
+    def _play(self, move):
+        """Applies a Move, records it in the history (dropping any redo entries) and changes turn."""
+        undo = self.board.make_move(move)
+        # Redo entries are not counted in hash_counts, so they can simply be dropped
+        del self.history[self.ply:]
+        del self.position_hashes[self.ply + 1:]
+        self.history.append((move, undo))
+        self.change_turn()
+        self.ply += 1
+        key = self.board.hash_key(self.turn)
+        self.position_hashes.append(key)
+        self.hash_counts[key] = self.hash_counts.get(key, 0) + 1
+        self.last_move = move
+
+    def undo(self):
+        """Takes back the last ply. Returns False if already at the start of the game."""
+        if self.ply == 0:
+            return False
+        key = self.position_hashes[self.ply]
+        self.hash_counts[key] -= 1
+        self.ply -= 1
+        move, undo = self.history[self.ply]
+        self.board.unmake_move(move, undo)
+        self.change_turn()
+        self.last_move = self.history[self.ply - 1][0] if self.ply else None
+        self.winner_result = None
+        return True
+
+    def redo(self):
+        """Replays the next undone ply. Returns False if there is nothing to redo."""
+        if self.ply == len(self.history):
+            return False
+        move, _ = self.history[self.ply]
+        # make_move returns the same undo info again, keep the fresh one
+        self.history[self.ply] = (move, self.board.make_move(move))
+        self.change_turn()
+        self.ply += 1
+        key = self.position_hashes[self.ply]
+        self.hash_counts[key] = self.hash_counts.get(key, 0) + 1
+        self.last_move = move
+        self.winner_result = None
+        return True
+
+    def go_to_ply(self, ply):
+        """Moves to any ply between 0 and len(history) by undoing/replaying diffs."""
+        ply = max(0, min(ply, len(self.history)))
+        while self.ply > ply:
+            self.undo()
+        while self.ply < ply:
+            self.redo()
+
+    def is_repetition(self, limit=REPETITION_LIMIT):
+        """Returns True if the current position (with side to move) occurred at least `limit` times."""
+        return self.hash_counts.get(self.position_hashes[self.ply], 0) >= limit
\ No newline at end of file
@@ -1,42 +1,161 @@
-from copy import deepcopy # Deepcopy for board state simulations 
 import pygame
-from .constants import RED, WHITE
+from .constants import RED, WHITE, ROWS
+from .cache import EXACT, LOWER_BOUND, UPPER_BOUND, encode_move, mirror_entry
+from .move import Move
 
-def minimax(current_board_state, depth, is_max_player, game, alpha, beta):
+class SelectiveSearch:
+    """
+    Selective search settings for minimax, each feature can be toggled and tuned on its own.
+
+    Late move reductions (LMR): at nodes with depth >= lmr_min_depth, quiet moves after the first
+    lmr_full_moves in the ordered list are searched lmr_reduction plies shallower, and re-searched
+    at full depth if they still improve on the current best (fail high).
+    Futility pruning: at depth 1 nodes, quiet moves are skipped when the static Board.evaluate score
+    plus futility_margin cannot reach the alpha-beta window. Only depth 1 is pruned: its children are
+    static leaves, while deeper children score +-inf when a quiet move leaves the reply side without moves.
+    The margin is in evaluate units (1 per piece, 0.1 per row of advancement).
+    Captures and kinging moves are never reduced or pruned.
+    """
+    def __init__(self, lmr=True, lmr_min_depth=4, lmr_full_moves=3, lmr_reduction=1,
+                 futility=True, futility_margin=0.2):
+        self.lmr = lmr
+        self.lmr_min_depth = lmr_min_depth
+        self.lmr_full_moves = lmr_full_moves
+        self.lmr_reduction = lmr_reduction
+        self.futility = futility
+        # A quiet move changes the evaluation by at most 0.1, the margin leaves room to spare
+        self.futility_margin = futility_margin
+
+    def __repr__(self):
+        return (f"SelectiveSearch(lmr={self.lmr}, lmr_min_depth={self.lmr_min_depth}, lmr_full_moves={self.lmr_full_moves}, "
+                f"lmr_reduction={self.lmr_reduction}, futility={self.futility}, futility_margin={self.futility_margin})")
+
+class SearchStats:
+    """Counters updated by minimax, reset them before a search to measure it."""
+    def __init__(self):
+        self.nodes = 0 # minimax calls, including leaves
+
+    def reset(self):
+        self.nodes = 0
+
+stats = SearchStats()
+
+def is_quiet_move(board, move):
+    """Returns True if a Move neither captures nor crowns a king."""
+    if move.captured:
+        return False
+    piece = board.get_piece(*move.from_square)
+    row = move.to_square[0]
+    return piece.king or not ((row == 0 and piece.color == RED) or (row == ROWS - 1 and piece.color == WHITE))
+
+def _move_code(move):
+    """Returns the 16-bit cache code for a Move."""
+    return encode_move(*move.from_square, *move.to_square)
+
+def minimax(current_board_state, depth, is_max_player, game, alpha, beta, cache=None, order_rng=None, selective=None):
     """
     Minimax algorithm w Alpha-Beta pruning.
 
+    Moves are made and unmade on current_board_state itself, which is back in its original
+    state when the search returns.
+
     current_board_state: Current Board object state to evaluate.
     depth: Move depth to search.
     is_max_player: (bool) True if maximizing (AI turn), False if minimizing (Opponent turn).
     game: Main Game object.
     alpha: Alpha value for pruning.
     beta: Beta value for pruning.
+    cache: Optional transposition table (PersistentCache or SharedTranspositionTable), keyed by Board.canonical_key.
+    order_rng: Optional random.Random used to shuffle move order (Lazy SMP helper workers).
+    selective: Optional SelectiveSearch settings (late move reductions, futility pruning).
 
-    Returns: [move_evaluation_score, best_move_board_state]
+    Returns: [move_evaluation_score, principal_variation]
+    principal_variation is the list of Moves expected from here, its first Move is the best move.
+    It is empty at leaves and when the side to move has no moves.
     """
+    stats.nodes += 1
+
     # --- Base Cases ---
     # 1. Reached maximum search depth
     # 2. A player has won (no opponent pieces left)
     if depth == 0 or current_board_state.winner() is not None:
-        # Return static evaluation of the board and the board itself (no further move from here)
-        return current_board_state.evaluate(), current_board_state
+        # Return static evaluation of the board (no further move from here)
+        return current_board_state.evaluate(), []
+
+    color = WHITE if is_max_player else RED
+    moves = get_move_list(current_board_state, color)
+
+    # --- Cache Lookup ---
+    key = None
+    ordered = 0 # Number of moves at the front of the list already placed by the cache
+    if cache is not None:
+        # Mirror positions share one key, their entries are stored from the canonical side's view
+        key, mirrored = current_board_state.canonical_key(color)
+        entry = cache.probe(key)
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, entry_best = entry
+            if mirrored:
+                entry_score, entry_flag, entry_best = mirror_entry(entry_score, entry_flag, entry_best)
+            # Find the cached best move among the legal moves (guards against hash collisions)
+            best_index = next((i for i, move in enumerate(moves) if _move_code(move) == entry_best), None)
+            if best_index is not None:
+                # Search the cached best move first, it is the most likely cutoff
+                moves.insert(0, moves.pop(best_index))
+                ordered = 1
+                if entry_depth >= depth and (entry_flag == EXACT
+                                             or (entry_flag == LOWER_BOUND and entry_score >= beta)
+                                             or (entry_flag == UPPER_BOUND and entry_score <= alpha)):
+                    return entry_score, [moves[0]]
+
+    # Perturb the order of the remaining moves so parallel workers explore different subtrees
+    if order_rng is not None:
+        remaining = moves[ordered:]
+        order_rng.shuffle(remaining)
+        moves[ordered:] = remaining
+
+    # --- Selective Search Setup ---
+    # With forced captures, a position with any capture has only captures, so nothing here is quiet
+    has_quiet_moves = selective is not None and bool(moves) and not moves[0].captured
+    reduce_late_moves = has_quiet_moves and selective.lmr and depth >= selective.lmr_min_depth
+    futility_margin = None
+    if has_quiet_moves and selective.futility and depth == 1:
+        futility_margin = selective.futility_margin
+        static_eval = current_board_state.evaluate()
+
+    original_alpha, original_beta = alpha, beta
+    best_pv = [] # Principal variation starting with the best move found so far
 
     # --- Recursive Step ---
     if is_max_player: # AI's turn (wants to maximize score)
         max_eval = float('-inf') # Initialize with lowest possible score
-        best_move_board = None   # Track board state leading to max_eval
-
-        # Iterate through all possible moves (resulting board states) for the maximizer
-        for potential_next_board in get_all_moves(current_board_state, WHITE, game):
+        # Futility: quiet moves cannot lift the score past static eval + margin, prune them if that is <= alpha
+        futile = futility_margin is not None and static_eval + futility_margin <= alpha
+        pruned_bound = float('-inf') # Upper bound for the score of pruned moves
+
+        # Iterate through all possible moves for the maximizer
+        for index, move in enumerate(moves):
+            quiet = has_quiet_moves and is_quiet_move(current_board_state, move)
+            if futile and quiet:
+                pruned_bound = static_eval + futility_margin
+                continue
+
+            undo = current_board_state.make_move(move)
             # Recursively call minimax for opponent's turn (minimizer)
             # Depth is decreased by 1, is_max_player is False
-            evaluation, _ = minimax(potential_next_board, depth - 1, False, game, alpha, beta)
+            if reduce_late_moves and quiet and index >= selective.lmr_full_moves:
+                # Late move reduction, re-search at full depth if the reduced search beats alpha
+                reduced_depth = max(depth - 1 - selective.lmr_reduction, 0)
+                evaluation, pv = minimax(current_board_state, reduced_depth, False, game, alpha, beta, cache, order_rng, selective)
+                if evaluation > alpha:
+                    evaluation, pv = minimax(current_board_state, depth - 1, False, game, alpha, beta, cache, order_rng, selective)
+            else:
+                evaluation, pv = minimax(current_board_state, depth - 1, False, game, alpha, beta, cache, order_rng, selective)
+            current_board_state.unmake_move(move, undo)
 
             # Update max_eval if this move leads to a better score
             if evaluation > max_eval:
                 max_eval = evaluation
-                best_move_board = potential_next_board # Store this board state
+                best_pv = [move] + pv
 
             # Alpha-Beta Pruning Check (Maximizer)
             alpha = max(alpha, evaluation) # Update alpha (best option for maximizer found so far)
@@ -44,22 +163,38 @@ def minimax(current_board_state, depth, is_max_player, game, alpha, beta):
                 # If beta <= alpha, the minimizing player (parent node) would have already pruned this branch
                 break # Prune this branch, stop exploring further moves from this state
 
-        return max_eval, best_move_board
+        best_eval = max(max_eval, pruned_bound)
 
     else: # Minimizing player's turn (wants to minimize the score for ai)
         min_eval = float('+inf') # Initialize with highest possible score
-        best_move_board = None   # Track board state leading to min_eval
-
-        # Iterate through all possible moves (resulting board states) for the minimizer
-        for potential_next_board in get_all_moves(current_board_state, RED, game):
+        # Futility: quiet moves cannot push the score below static eval - margin, prune them if that is >= beta
+        futile = futility_margin is not None and static_eval - futility_margin >= beta
+        pruned_bound = float('+inf') # Lower bound for the score of pruned moves
+
+        # Iterate through all possible moves for the minimizer
+        for index, move in enumerate(moves):
+            quiet = has_quiet_moves and is_quiet_move(current_board_state, move)
+            if futile and quiet:
+                pruned_bound = static_eval - futility_margin
+                continue
+
+            undo = current_board_state.make_move(move)
             # Recursively call minimax for maximizer's turn
             # Depth is decreased by 1, is_max_player is True
-            evaluation, _ = minimax(potential_next_board, depth - 1, True, game, alpha, beta)
+            if reduce_late_moves and quiet and index >= selective.lmr_full_moves:
+                # Late move reduction, re-search at full depth if the reduced search beats beta
+                reduced_depth = max(depth - 1 - selective.lmr_reduction, 0)
+                evaluation, pv = minimax(current_board_state, reduced_depth, True, game, alpha, beta, cache, order_rng, selective)
+                if evaluation < beta:
+                    evaluation, pv = minimax(current_board_state, depth - 1, True, game, alpha, beta, cache, order_rng, selective)
+            else:
+                evaluation, pv = minimax(current_board_state, depth - 1, True, game, alpha, beta, cache, order_rng, selective)
+            current_board_state.unmake_move(move, undo)
 
             # Update min_eval if this move leads to a lower score (better for minimizer)
             if evaluation < min_eval:
                 min_eval = evaluation
-                best_move_board = potential_next_board
+                best_pv = [move] + pv
 
             # Alpha-Beta Pruning Check (Minimizer)
             beta = min(beta, evaluation) # Update beta (best option for minimizer found so far)
@@ -67,65 +202,39 @@ def minimax(current_board_state, depth, is_max_player, game, alpha, beta):
                 # If beta <= alpha, maximizing player (parent node) will prune this branch.
                 break 
 
-        return min_eval, best_move_board
+        best_eval = min(min_eval, pruned_bound)
 
+    # --- Cache Store ---
+    if key is not None and best_pv:
+        if best_eval <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_eval >= original_beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        entry_score, entry_flag, entry_best = best_eval, flag, _move_code(best_pv[0])
+        if mirrored:
+            entry_score, entry_flag, entry_best = mirror_entry(entry_score, entry_flag, entry_best)
+        cache.store(key, depth, entry_score, entry_flag, entry_best)
 
-def simulate_move(piece, move_coords, board_copy, skipped_pieces):
-    """
-    Simulates making a move on copy of board.
-    Modifies board copy to reflect the move and any captures.
-    """
-    # Perform move on the copied board
-    board_copy.move(piece, move_coords[0], move_coords[1])
-    # If pieces were captured during this move, remove them from the copied board
-    if skipped_pieces:
-        board_copy.remove(skipped_pieces)
-    return board_copy
-
-def get_all_moves(board, color, game):
+    return best_eval, best_pv
+
+
+def get_move_list(board, color):
     """
-    Generates all possible board states reachable in one turn by the given color,
-    respecting the forced capture rule.
+    Returns all legal Moves for the given color, respecting the forced capture rule.
+    No board copies are made.
     """
-    possible_capture_boards = [] # List to store resulting board states from captures
-    possible_simple_boards = []  # List to store resulting board states from simple moves
-    found_capture = False        # Flag to track if any capture is possible
+    capture_moves = [] # Moves that capture at least one piece
+    simple_moves = []  # Plain diagonal steps
 
-    # Iterate through all pieces of the given color on the board
     for piece in board.get_all_pieces(color):
-        # Get all valid moves (including jumps) for the current piece
-        valid_moves = board.get_valid_moves(piece) # Returns {(row, col): [skipped]}
-
-        # For each valid move destination
-        for move_coords, skipped_pieces_info in valid_moves.items():
-            # --- Create a deep copy of the board for simulation ---
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            # Get skipped pieces references from the temp_board
-            temp_skipped_pieces = [temp_board.get_piece(p.row, p.col) for p in skipped_pieces_info if p != 0]
-
-            # Simulate the move on temporary board copy
-            new_board_state = simulate_move(temp_piece, move_coords, temp_board, temp_skipped_pieces)
-
-            # Check if this move was a capture
-            if skipped_pieces_info: # If the list of skipped pieces is not empty
-                possible_capture_boards.append(new_board_state)
-                found_capture = True
-            else: # This was a simple move
-                # Only add simple moves if we might need them later
-                if not found_capture:
-                    possible_simple_boards.append(new_board_state)
-            # Optimization: If we found a capture, we no longer need to store simple moves for *this specific piece*
-            # but we still need to check *other pieces* in case they have captures.
-            # However, if we've already found *any* capture from *any* piece,
-            # we can stop collecting simple moves altogether for efficiency.
-            if found_capture:
-                 possible_simple_boards = [] # Clear simple moves if a capture exists anywhere
+        for move_coords, skipped_pieces_info in board.get_valid_moves(piece).items():
+            if skipped_pieces_info:
+                captured = tuple((p.row, p.col) for p in skipped_pieces_info if p != 0)
+                capture_moves.append(Move((piece.row, piece.col), move_coords, captured))
+            elif not capture_moves: # Simple moves are irrelevant once any capture exists
+                simple_moves.append(Move((piece.row, piece.col), move_coords, ()))
 
     # --- Apply Forced Capture Rule ---
-    if found_capture:
-        # If any capture move was found, only return the boards resulting from captures
-        return possible_capture_boards
-    else:
-        # If no captures were found, return all the boards resulting from simple moves
-        return possible_simple_boards
\ No newline at end of file
+    return capture_moves if capture_moves else simple_moves
@@ -0,0 +1,15 @@
+from collections import namedtuple
+
+class Move(namedtuple('Move', ['from_square', 'to_square', 'captured'])):
+    """
+    Lightweight record of one turn: (row, col) of the moving piece before and after,
+    plus a tuple of (row, col) squares of the pieces it captured.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        """Readable form for logs, e.g. '(5, 0) -> (3, 2) x (4, 1)'."""
+        text = f"{self.from_square} -> {self.to_square}"
+        if self.captured:
+            text += " x " + ", ".join(str(square) for square in self.captured)
+        return text
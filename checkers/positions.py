@@ -0,0 +1,87 @@
+from .constants import ROWS, COLS, RED, WHITE
+from .board import Board
+from .piece import Piece
+
+# Diagram characters: '.' empty, 'r'/'w' red/white man, 'R'/'W' red/white king.
+# White starts at the top (row 0) and moves down, red moves up.
+_DIAGRAM_PIECES = {'r': (RED, False), 'R': (RED, True), 'w': (WHITE, False), 'W': (WHITE, True)}
+
+def board_from_diagram(diagram):
+    """Builds a Board from a list of 8 strings of 8 characters (see _DIAGRAM_PIECES)."""
+    if len(diagram) != ROWS or any(len(line) != COLS for line in diagram):
+        raise ValueError(f"Board diagram must be {ROWS} rows of {COLS} characters")
+
+    board = Board()
+    board.board = [[0] * COLS for _ in range(ROWS)]
+    board.red_left = board.white_left = 0
+    board.red_kings = board.white_kings = 0
+
+    for row, line in enumerate(diagram):
+        for col, char in enumerate(line):
+            if char == '.':
+                continue
+            if char not in _DIAGRAM_PIECES:
+                raise ValueError(f"Unknown diagram character {char!r} at ({row}, {col})")
+            if col % 2 != ((row + 1) % 2):
+                raise ValueError(f"Piece on light square ({row}, {col})")
+            color, king = _DIAGRAM_PIECES[char]
+            piece = Piece(row, col, color)
+            if king:
+                piece.make_king()
+            board.board[row][col] = piece
+            if color == RED:
+                board.red_left += 1
+                board.red_kings += king
+            else:
+                board.white_left += 1
+                board.white_kings += king
+    return board
+
+
+# Fixed positions for benchmarks: {name: (diagram, color to move)}
+BENCHMARK_POSITIONS = {
+    'opening': ([
+        '.w.w.w.w',
+        'w.w.w.w.',
+        '.w.w.w.w',
+        '........',
+        '........',
+        'r.r.r.r.',
+        '.r.r.r.r',
+        'r.r.r.r.',
+    ], WHITE),
+    'middlegame': ([
+        '.w.w.w.w',
+        'w.w...w.',
+        '...w.w..',
+        'w...r...',
+        '.r...w..',
+        'r...r.r.',
+        '.r.r...r',
+        'r.r.r.r.',
+    ], WHITE),
+    'multi_jump': ([
+        '.w...w..',
+        '..w.....',
+        '...r...w',
+        '........',
+        '.....r..',
+        'r.r.....',
+        '.r...r..',
+        '....r...',
+    ], WHITE),
+    'king_endgame': ([
+        '........',
+        '..W.....',
+        '........',
+        '....R...',
+        '.W......',
+        '......R.',
+        '...R....',
+        '........',
+    ], RED),
+}
+
+def benchmark_positions():
+    """Returns a list of (name, board, color to move) for every benchmark position."""
+    return [(name, board_from_diagram(diagram), color) for name, (diagram, color) in BENCHMARK_POSITIONS.items()]
@@ -0,0 +1,108 @@
+import argparse
+import random
+import time
+
+from .constants import RED, WHITE
+from .board import Board
+from .minimax import minimax, get_move_list, SelectiveSearch
+from .positions import benchmark_positions
+
+MAX_PLIES = 150 # Games still running after this many plies are adjudicated by material
+ADJUDICATION_MARGIN = 1 # Material lead (pieces, kings count 1.5) needed to win at the ply cap
+
+
+def play_game(white_selective, red_selective, depth, seed, opening_plies=4):
+    """
+    Plays one AI vs AI game from the starting position, after `opening_plies` random moves
+    (chosen with `seed`) so that repeated games differ.
+
+    Returns: (result, capped) where result is WHITE, RED or 'DRAW' and capped is True
+    if the game reached MAX_PLIES and was adjudicated by material.
+    """
+    rng = random.Random(seed)
+    board = Board()
+    turn = RED # Red starts
+    for ply in range(MAX_PLIES):
+        if board.winner() is not None:
+            return board.winner(), False
+        if ply < opening_plies:
+            moves = get_move_list(board, turn)
+            move = rng.choice(moves) if moves else None
+        else:
+            selective = white_selective if turn == WHITE else red_selective
+            _, pv = minimax(board, depth, turn == WHITE, None, float('-inf'), float('+inf'), selective=selective)
+            move = pv[0] if pv else None
+        if move is None: # Side to move is stuck, a stalemate like in Game.check_winner
+            return 'DRAW', False
+        board.make_move(move)
+        turn = RED if turn == WHITE else WHITE
+    return _adjudicate(board), True
+
+def _adjudicate(board):
+    """Scores an unfinished game by material: WHITE or RED if ahead by ADJUDICATION_MARGIN, else 'DRAW'."""
+    lead = (board.white_left + 0.5 * board.white_kings) - (board.red_left + 0.5 * board.red_kings)
+    if lead >= ADJUDICATION_MARGIN:
+        return WHITE
+    if lead <= -ADJUDICATION_MARGIN:
+        return RED
+    return 'DRAW'
+
+def time_to_depth(selective, depth):
+    """Returns {position name: seconds} for a depth `depth` search of each benchmark position."""
+    times = {}
+    for name, board, color in benchmark_positions():
+        start = time.perf_counter()
+        minimax(board, depth, color == WHITE, None, float('-inf'), float('+inf'), selective=selective)
+        times[name] = time.perf_counter() - start
+    return times
+
+def compare(candidate, baseline=None, depth=4, games=10):
+    """Prints time-to-depth and a self-play match score of `candidate` against `baseline` settings."""
+    print(f"Candidate: {candidate}")
+    print(f"Baseline:  {baseline if baseline is not None else 'full-width search'}")
+
+    print(f"\nTime-to-depth {depth}")
+    candidate_times = time_to_depth(candidate, depth)
+    baseline_times = time_to_depth(baseline, depth)
+    for name in candidate_times:
+        print(f"{name:<14}{baseline_times[name]:>9.3f}s ->{candidate_times[name]:>9.3f}s "
+              f"({baseline_times[name] / candidate_times[name]:4.2f}x)")
+    total_baseline, total_candidate = sum(baseline_times.values()), sum(candidate_times.values())
+    print(f"{'total':<14}{total_baseline:>9.3f}s ->{total_candidate:>9.3f}s ({total_baseline / total_candidate:4.2f}x)")
+
+    # Each opening is played twice with colors swapped so neither side keeps a first-move edge
+    wins = losses = draws = capped_games = 0
+    for game_index in range(games):
+        seed = game_index // 2
+        candidate_color = WHITE if game_index % 2 == 0 else RED
+        if candidate_color == WHITE:
+            result, capped = play_game(candidate, baseline, depth, seed)
+        else:
+            result, capped = play_game(baseline, candidate, depth, seed)
+        capped_games += capped
+        if result == 'DRAW':
+            draws += 1
+        elif result == candidate_color:
+            wins += 1
+        else:
+            losses += 1
+    print(f"\nSelf-play at depth {depth}, candidate vs baseline: +{wins} -{losses} ={draws}")
+    print(f"{capped_games} of {games} games reached the {MAX_PLIES}-ply cap and were adjudicated by material")
+
+
+if __name__ == '__main__':
+    defaults = SelectiveSearch()
+    parser = argparse.ArgumentParser(description="Compare selective search settings against full-width search.")
+    parser.add_argument('--depth', type=int, default=4, help="search depth (default 4)")
+    parser.add_argument('--games', type=int, default=10, help="self-play games, colors alternate (default 10)")
+    parser.add_argument('--lmr', action=argparse.BooleanOptionalAction, default=defaults.lmr, help="late move reductions")
+    parser.add_argument('--lmr-min-depth', type=int, default=defaults.lmr_min_depth)
+    parser.add_argument('--lmr-full-moves', type=int, default=defaults.lmr_full_moves)
+    parser.add_argument('--lmr-reduction', type=int, default=defaults.lmr_reduction)
+    parser.add_argument('--futility', action=argparse.BooleanOptionalAction, default=defaults.futility, help="futility pruning")
+    parser.add_argument('--futility-margin', type=float, default=defaults.futility_margin,
+                        help="margin at depth 1 nodes, in evaluate units")
+    args = parser.parse_args()
+    candidate = SelectiveSearch(args.lmr, args.lmr_min_depth, args.lmr_full_moves, args.lmr_reduction,
+                                args.futility, args.futility_margin)
+    compare(candidate, depth=args.depth, games=args.games)
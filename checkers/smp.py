@@ -0,0 +1,212 @@
+import argparse
+import multiprocessing
+import random
+import time
+from multiprocessing import shared_memory
+
+from .constants import WHITE
+from .cache import SlotTable, _SLOT
+from .minimax import minimax
+from .positions import benchmark_positions
+
+
+class SharedTranspositionTable(SlotTable):
+    """
+    Transposition table in multiprocessing.shared_memory, shared lock-free by all Lazy SMP workers.
+    Create it in the parent process, workers attach to it by name.
+    """
+    DEFAULT_SLOTS = 1 << 18 # 6 MB
+
+    def __init__(self, slots=DEFAULT_SLOTS, name=None, generation=0):
+        """Creates a new zero-filled table, or attaches to the existing one called `name`."""
+        self.slots = slots
+        self.generation = generation
+        self._base = 0
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=slots * _SLOT.size)
+        else:
+            # Workers share the parent's resource tracker, so attaching does not add a second owner
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._buffer = self._shm.buf
+        self.name = self._shm.name
+
+    def new_search(self):
+        """Starts a new generation, entries from searches MAX_ENTRY_AGE or more generations ago become replaceable."""
+        self.generation = (self.generation + 1) & 0xFFFF
+
+    def store(self, key, depth, score, flag, best):
+        """Writes a search result straight into the shared table."""
+        self._write_slot(key, depth, score, flag, best)
+
+    def close(self):
+        """Detaches from the table, and frees it if this process created it."""
+        self._buffer.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class _SearchStopped(Exception):
+    """Raised inside a helper's search once the main worker has finished that search."""
+
+
+class _HelperTable(SharedTranspositionTable):
+    """A helper's view of the shared table, aborts the helper's search when the pool moves past it."""
+
+    def __init__(self, slots, name, current_search):
+        super().__init__(slots, name=name)
+        self._current_search = current_search # Shared counter, see LazySMPPool
+        self.search_id = None
+
+    def probe(self, key):
+        """Same as SharedTranspositionTable.probe, but raises _SearchStopped if this search is over."""
+        # minimax probes at every inner node, so a stopped helper notices within one node
+        if self._current_search.value != self.search_id:
+            raise _SearchStopped
+        return super().probe(key)
+
+
+def _iterative_deepening(board, depth, is_max_player, table, order_rng, selective):
+    """Searches depth 1..depth, each iteration seeding move order for the next through the table."""
+    score, pv = None, []
+    for current_depth in range(1, depth + 1):
+        score, pv = minimax(board, current_depth, is_max_player, None, float('-inf'), float('+inf'), table, order_rng, selective)
+    return score, pv
+
+def _helper_worker(worker_id, table_name, slots, current_search, tasks, ready):
+    """
+    Lazy SMP helper process: for each root position from `tasks`, searches it with its own move order
+    to fill the shared table, until the pool stops that search. A None task shuts the helper down.
+    """
+    table = _HelperTable(slots, table_name, current_search)
+    order_rng = random.Random(worker_id)
+    ready.put(worker_id)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        table.search_id, table.generation, board, depth, is_max_player, selective = task
+        try:
+            # Odd helpers search one ply deeper, which spreads the workers over more of the tree
+            _iterative_deepening(board, depth + worker_id % 2, is_max_player, table, order_rng, selective)
+        except _SearchStopped:
+            pass # The board is this process's own copy, so it can be left mid-search
+    table.close()
+
+
+class LazySMPPool:
+    """
+    Lazy SMP search with `workers - 1` helper processes that are started once and reused for every search.
+    Each search sends the root position to all helpers, which search it with their own move-order
+    perturbation while this process (the main worker) searches it too, all sharing one transposition table.
+    Once the main worker reaches the requested depth the helpers abandon the search and wait for the next one.
+    """
+
+    def __init__(self, workers=4, table=None):
+        """
+        Starts the helpers and waits until they are all attached to the table.
+
+        table: Optional SharedTranspositionTable to use (a new one is made and freed on close otherwise).
+        """
+        self.workers = workers
+        self._owns_table = table is None
+        self.table = SharedTranspositionTable() if self._owns_table else table
+        # Number of the running search, helpers stop as soon as it no longer matches their task.
+        # Only this process writes it, so it needs no lock.
+        self._current_search = multiprocessing.RawValue('q', 0)
+        self._tasks = []
+        self._helpers = []
+        ready = multiprocessing.SimpleQueue()
+        for worker_id in range(1, workers):
+            tasks = multiprocessing.SimpleQueue()
+            process = multiprocessing.Process(target=_helper_worker, daemon=True,
+                                              args=(worker_id, self.table.name, self.table.slots, self._current_search, tasks, ready))
+            process.start()
+            self._tasks.append(tasks)
+            self._helpers.append(process)
+        for _ in self._helpers:
+            ready.get()
+
+    def search(self, board, depth, is_max_player, selective=None):
+        """
+        Searches `board` to `depth` with all workers.
+
+        selective: Optional SelectiveSearch settings, used by every worker.
+
+        Returns: [move_evaluation_score, principal_variation], same as minimax.
+        """
+        self.table.new_search()
+        self._current_search.value += 1
+        task = (self._current_search.value, self.table.generation, board, depth, is_max_player, selective)
+        for tasks in self._tasks:
+            tasks.put(task)
+        try:
+            return _iterative_deepening(board, depth, is_max_player, self.table, None, selective)
+        finally:
+            self._current_search.value += 1 # Stops the helpers
+
+    def close(self):
+        """Shuts the helpers down, and frees the table if the pool created it."""
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._helpers:
+            process.join()
+        self._tasks, self._helpers = [], []
+        if self._owns_table:
+            self.table.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def lazy_smp_search(board, depth, is_max_player, workers=4, table=None, selective=None):
+    """
+    One Lazy SMP search with a temporary LazySMPPool. This includes starting and stopping the helper
+    processes, so use a LazySMPPool directly when searching repeatedly.
+
+    table: Optional SharedTranspositionTable to reuse between searches (a temporary one is made otherwise).
+    selective: Optional SelectiveSearch settings, used by every worker.
+
+    Returns: [move_evaluation_score, principal_variation], same as minimax.
+    """
+    with LazySMPPool(workers, table) as pool:
+        return pool.search(board, depth, is_max_player, selective)
+
+
+def benchmark(depth, worker_counts):
+    """
+    Prints Lazy SMP time-to-depth and speedup over one worker for each benchmark position.
+    Each worker count gets one pool, started before timing, so process startup is not measured.
+    """
+    print(f"Lazy SMP time-to-depth {depth}")
+    print(f"{'position':<14}" + ''.join(f"{f'{n} workers':>22}" for n in worker_counts))
+    totals = {n: 0.0 for n in worker_counts}
+    times = {}
+    for workers in worker_counts:
+        with LazySMPPool(workers) as pool:
+            for name, board, color in benchmark_positions():
+                start = time.perf_counter()
+                pool.search(board, depth, color == WHITE)
+                times[name, workers] = time.perf_counter() - start
+                totals[workers] += times[name, workers]
+    for name, _, _ in benchmark_positions():
+        row = f"{name:<14}"
+        for workers in worker_counts:
+            row += f"{times[name, workers]:>13.3f}s ({times[name, worker_counts[0]] / times[name, workers]:4.2f}x)"
+        print(row)
+    row = f"{'total':<14}"
+    for workers in worker_counts:
+        row += f"{totals[workers]:>13.3f}s ({totals[worker_counts[0]] / totals[workers]:4.2f}x)"
+    print(row)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark Lazy SMP search speedup.")
+    parser.add_argument('--depth', type=int, default=6, help="search depth (default 6)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16], help="worker counts to compare")
+    args = parser.parse_args()
+    benchmark(args.depth, args.workers)
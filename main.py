@@ -4,9 +4,12 @@ import time
 
 from checkers.constants import *
 from checkers.game import Game
-from checkers.minimax import minimax
+from checkers.minimax import minimax, SelectiveSearch
+from checkers.cache import PersistentCache
 
 FPS = 60
+SEARCH_CACHE_PATH = None # e.g. 'search_cache.bin' to keep AI search results across games and restarts
+AI_SELECTIVE_SEARCH = None # Full-width search, SelectiveSearch() turns on late move reductions + futility pruning
 # AI_DEPTH = 3 # Depth of the minimax search tree, adjust for difficulty lvl, handled in menu
 
 # Game States
@@ -64,6 +67,7 @@ def main():
     run = True
     clock = pygame.time.Clock()
     game = Game(WIN)
+    search_cache = PersistentCache(SEARCH_CACHE_PATH) if SEARCH_CACHE_PATH else None
 
     game_state = STATE_START_MENU
     selected_difficulty = None
@@ -160,16 +164,28 @@ def main():
                                 ai_is_thinking = True
                                 ai_think_start_time = pygame.time.get_ticks()
                                 needs_ai_move = False
+                if event.type == pygame.KEYDOWN and not ai_is_thinking and not needs_ai_move:
+                    # Left/Right arrows: undo/redo back to the previous/next position with Red to move
+                    if event.key == pygame.K_LEFT and game.undo():
+                        while game.turn != RED and game.undo():
+                            pass
+                    elif event.key == pygame.K_RIGHT and game.redo():
+                        while game.turn != RED and game.redo():
+                            pass
+                    if game.turn == WHITE: # Redo stopped at the end of history with the AI to move
+                        ai_is_thinking = True
+                        ai_think_start_time = pygame.time.get_ticks()
 
             # --- AI Turn Logic ---
             if game.turn == WHITE and needs_ai_move: # AI's turn
                 is_maximizing = True # AI is white, maximizing
-                value, new_board = minimax(game.get_board(), ai_depth, is_maximizing, game, float('-inf'), float('+inf'))
+                value, pv = minimax(game.get_board(), ai_depth, is_maximizing, game, float('-inf'), float('+inf'), search_cache, selective=AI_SELECTIVE_SEARCH)
 
-                if new_board is None:
+                if not pv:
                     print("AI has no valid moves!")
                 else:
-                    game.ai_move(new_board)
+                    print(f"AI move: {pv[0]} (eval {value:.2f}, line: {', '.join(str(move) for move in pv)})")
+                    game.ai_move(pv[0])
                 
                 needs_ai_move = False # AI has made its move
 
@@ -233,6 +249,8 @@ def main():
             # --- Game Over Drawing ---
             if winner_info == 'STALEMATE':
                 message = "Stalemate!"
+            elif winner_info == 'REPETITION':
+                message = "Draw by repetition!"
             elif winner_info == WHITE:
                  message = "AI Wins!"
             else:
@@ -255,6 +273,8 @@ def main():
 
     # --- Cleanup ---
     print("Exiting Pygame.")
+    if search_cache:
+        search_cache.close()
     pygame.quit()
     sys.exit()
 